@@ -15,11 +15,80 @@ Snowflake DDL files to the new_snowflake_table_creation directory.
 """
 
 import argparse  # For command-line argument parsing
+import io        # For building the converted DDL in a string buffer
 import logging   # For progress and error reporting
+import os        # For the worker count and plain string path handling
 import re        # For regular expressions to parse and convert SQL
+import sys       # For the platform check on the worker count
+from concurrent.futures import ProcessPoolExecutor  # For converting table files in parallel
 from pathlib import Path  # For cross-platform file path handling
 
 
+# Matches a string literal (group 1, kept) or a -- / /* */ comment (removed).
+# The block comment part is written as an unrolled loop so it never backtracks.
+_RE_COMMENT = re.compile(r"('(?:[^']|'')*')|--[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/")
+
+# DB2 special registers in default values and their Snowflake spelling
+_RE_CURRENT_TS = re.compile(r'\bCURRENT\s+TIMESTAMP\b', re.IGNORECASE)
+_RE_CURRENT_DATE = re.compile(r'\bCURRENT\s+DATE\b', re.IGNORECASE)
+_RE_CURRENT_TIME = re.compile(r'\bCURRENT\s+TIME\b', re.IGNORECASE)
+_RE_USER = re.compile(r'\bUSER\b', re.IGNORECASE)
+
+# Keywords that end the data type part of a column definition
+_RE_TYPE_END = re.compile(r'\b(NOT\s+NULL|WITH\s+DEFAULT|NULL|CONSTRAINT|PRIMARY\s+KEY|UNIQUE|CHECK)\b',
+                          re.IGNORECASE)
+
+# Table-level constraint lines in the column list (handled separately or dropped)
+_RE_CONSTRAINT_LINE = re.compile(r'(CONSTRAINT|PRIMARY\s+KEY|UNIQUE|CHECK)\b', re.IGNORECASE)
+
+# DB2 type name -> (Snowflake type or None to keep as-is, keep length/precision,
+# issue to log or None)
+_TYPE_MAP = {
+    # Numeric types
+    'DECIMAL': ('NUMBER', True, None),
+    'NUMERIC': ('NUMBER', True, None),
+    'SMALLINT': (None, False, None),
+    'INTEGER': (None, False, None),
+    'BIGINT': (None, False, None),
+    'REAL': ('FLOAT', False, None),
+    'DOUBLE': ('FLOAT', False, None),
+    'DECFLOAT': ('FLOAT', False, None),
+    # String types
+    'CHAR': (None, False, None),
+    'VARCHAR': (None, False, None),
+    'GRAPHIC': ('VARCHAR', True, "mapped (VAR)GRAPHIC to VARCHAR"),
+    'VARGRAPHIC': ('VARCHAR', True, "mapped (VAR)GRAPHIC to VARCHAR"),
+    'CLOB': ('VARCHAR', False, "CLOB mapped to VARCHAR (possible size loss)"),
+    'BLOB': ('BINARY', False, None),
+    # Special types
+    'XML': ('VARIANT', False, "XML mapped to VARIANT"),
+    'DATE': (None, False, None),
+    'TIME': (None, False, None),
+    'TIMESTAMP': ('TIMESTAMP_NTZ', True, None),
+}
+
+# Type name at the start of a DB2 data type, built from the keys of _TYPE_MAP
+# (longest first, so a name is tried before any shorter name it starts with)
+_RE_TYPE_HEAD = re.compile('(' + '|'.join(sorted(_TYPE_MAP, key=len, reverse=True)) + r')\b')
+
+# DB2-specific table options with no Snowflake equivalent (CCSID is the most common)
+_RE_SKIP_OPTS = re.compile(r'\b(CCSID|PARTITION\s+BY|AUDIT|DATA\s+CAPTURE)\b', re.IGNORECASE)
+
+# "WITH DEFAULT <value>" in the attribute part of a column definition
+_RE_WITH_DEFAULT = re.compile(r'WITH\s+DEFAULT\s+([^,\s]+(?:\s+[^,\s]+)*)', re.IGNORECASE)
+
+# Inline (column-level) and table-level PRIMARY KEY definitions
+_RE_PK_INLINE = re.compile(r'(\w+)\s+[^,\n]+\s+PRIMARY\s+KEY', re.IGNORECASE)
+_RE_PK_KEYWORD = re.compile(r'PRIMARY\s+KEY', re.IGNORECASE)
+_RE_PK_TABLE = re.compile(r'PRIMARY\s+KEY\s*\(([^)]+)\)', re.IGNORECASE | re.DOTALL)
+
+# CREATE TABLE header: name (group 1), or schema (group 1) and table (group 2)
+_RE_CREATE = re.compile(r'CREATE\s+TABLE\s+(\w+)(?:\.(\w+))?', re.IGNORECASE)
+
+# String literal; parentheses inside it do not count towards the nesting depth
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
 def setup_logging():
     """
     Set up logging configuration for the script.
@@ -34,28 +103,62 @@ def setup_logging():
     )
 
 
-def log_issue(issues_file, table_name, column_section, issue, snippet):
+def strip_comments(content):
     """
-    Log an issue to the issues file for manual review.
+    Remove -- and /* */ comments from DDL, leaving string literals untouched.
     
-    This function appends issues to a log file in a pipe-delimited format.
-    Issues include data type conversions, ambiguous defaults, and other
-    transformations that might need manual verification.
+    Table files written with --keep-comments by the splitting script can contain
+    comments inside the column list; they are removed before conversion so they
+    don't end up in column definitions.
     
     Args:
-        issues_file (Path): Path to the issues log file
+        content (str): The DDL text
+        
+    Returns:
+        str: The DDL text without comments
+    """
+    return _RE_COMMENT.sub(lambda m: m.group(1) or '', content)
+
+
+def log_issue(issues, table_name, column_section, issue, snippet):
+    """
+    Record an issue for manual review in the list for the current file.
+    
+    This function records an issue in the list collected for the file being
+    converted; main() writes all of them to the issues log in a pipe-delimited
+    format at the end of the run. Issues include data type conversions,
+    ambiguous defaults, and other transformations that might need manual verification.
+    
+    Args:
+        issues (list): Issues collected for this file
         table_name (str): Name of the table where the issue occurred
         column_section (str): Column or section where the issue occurred
         issue (str): Description of the issue
         snippet (str): Code snippet that caused the issue (truncated to 80 chars)
     """
     # Truncate snippet to keep log file readable
-    snippet = snippet[:80] if len(snippet) > 80 else snippet
-    with open(issues_file, 'a', encoding='utf-8') as f:
-        f.write(f"{table_name} | {column_section} | {issue} | {snippet}\n")
+    issues.append((table_name, column_section, issue, snippet[:80]))
+
+
+def write_issues(issues_file, issues):
+    """
+    Write collected issues to the issues log file in one write.
+    
+    Each issue becomes one pipe-delimited line:
+    "table | column/section | issue | snippet". The file is replaced, so every
+    run starts with a fresh log.
+    
+    Args:
+        issues_file (Path): Path to the issues log file
+        issues (list): Issue tuples collected by log_issue()
+    """
+    issues_file.parent.mkdir(parents=True, exist_ok=True)
+    issues_file.write_text(''.join(f"{table_name} | {column_section} | {issue} | {snippet}\n"
+                                   for table_name, column_section, issue, snippet in issues),
+                           encoding='utf-8')
 
 
-def convert_data_type(db2_type, issues_file, table_name, column_name):
+def convert_data_type(db2_type, issues, table_name, column_name):
     """
     Convert DB2 data type to Snowflake data type.
     
@@ -65,7 +168,7 @@ def convert_data_type(db2_type, issues_file, table_name, column_name):
     
     Args:
         db2_type (str): The DB2 data type to convert
-        issues_file (Path): Path to the issues log file
+        issues (list): Issues collected for this file
         table_name (str): Name of the table (for logging)
         column_name (str): Name of the column (for logging)
         
@@ -81,59 +184,34 @@ def convert_data_type(db2_type, issues_file, table_name, column_name):
     
     # Handle FOR BIT DATA - maps to BINARY in Snowflake
     if 'FOR BIT DATA' in db2_type:
-        log_issue(issues_file, table_name, column_name, 
+        log_issue(issues, table_name, column_name, 
                  "mapped to BINARY from FOR BIT DATA", db2_type)
         return 'BINARY'
     
-    # Numeric type mappings
-    if db2_type.startswith('DECIMAL') or db2_type.startswith('NUMERIC'):
-        # DECIMAL and NUMERIC both become NUMBER in Snowflake
-        return db2_type.replace('DECIMAL', 'NUMBER').replace('NUMERIC', 'NUMBER')
-    elif db2_type in ['SMALLINT', 'INTEGER', 'BIGINT']:
-        # These types are directly compatible
-        return db2_type
-    elif db2_type in ['REAL', 'DOUBLE', 'DECFLOAT']:
-        # All floating point types become FLOAT in Snowflake
-        return 'FLOAT'
+    # TIMESTAMP WITH TIME ZONE is the one multi-word type with its own mapping
+    if db2_type.startswith('TIMESTAMP') and db2_type.endswith(' WITH TIME ZONE'):
+        return 'TIMESTAMP_TZ' + db2_type[9:-15].strip()
     
-    # String type mappings
-    elif db2_type.startswith('CHAR') or db2_type.startswith('VARCHAR'):
-        # CHAR and VARCHAR are directly compatible
+    # Look up the type name (first word, before any length/precision)
+    head_match = _RE_TYPE_HEAD.match(db2_type)
+    if head_match is None:
+        # Return as-is for unknown types (may need manual review)
         return db2_type
-    elif db2_type.startswith('GRAPHIC') or db2_type.startswith('VARGRAPHIC'):
-        # GRAPHIC types (Unicode) map to VARCHAR in Snowflake
-        log_issue(issues_file, table_name, column_name,
-                 "mapped (VAR)GRAPHIC to VARCHAR", db2_type)
-        return db2_type.replace('GRAPHIC', 'VARCHAR').replace('VARGRAPHIC', 'VARCHAR')
-    elif db2_type.startswith('CLOB'):
-        # CLOB (Character Large Object) maps to VARCHAR with potential size loss
-        log_issue(issues_file, table_name, column_name,
-                 "CLOB mapped to VARCHAR (possible size loss)", db2_type)
-        return 'VARCHAR'
-    elif db2_type.startswith('BLOB'):
-        # BLOB (Binary Large Object) maps to BINARY
-        return 'BINARY'
     
-    # Special type mappings
-    elif db2_type == 'XML':
-        # XML maps to VARIANT in Snowflake
-        log_issue(issues_file, table_name, column_name,
-                 "XML mapped to VARIANT", db2_type)
-        return 'VARIANT'
-    elif db2_type == 'DATE':
-        return 'DATE'
-    elif db2_type == 'TIME':
-        return 'TIME'
-    elif db2_type == 'TIMESTAMP WITH TIME ZONE':
-        return 'TIMESTAMP_TZ'
-    elif db2_type == 'TIMESTAMP':
-        return 'TIMESTAMP_NTZ'
-    else:
-        # Return as-is for unknown types (may need manual review)
+    head = head_match.group(1)
+    snowflake_type, keep_args, issue = _TYPE_MAP[head]
+    if issue:
+        log_issue(issues, table_name, column_name, issue, db2_type)
+    if snowflake_type is None:
+        # Directly compatible type
         return db2_type
+    if keep_args:
+        # Swap the type name, keep length/precision, e.g. DECIMAL(18,2) -> NUMBER(18,2)
+        return snowflake_type + db2_type[len(head):]
+    return snowflake_type
 
 
-def convert_default_value(default_expr, issues_file, table_name, column_name):
+def convert_default_value(default_expr, issues, table_name, column_name):
     """
     Convert DB2 default value to Snowflake format.
     
@@ -142,7 +220,7 @@ def convert_default_value(default_expr, issues_file, table_name, column_name):
     
     Args:
         default_expr (str): The DB2 default expression
-        issues_file (Path): Path to the issues log file
+        issues (list): Issues collected for this file
         table_name (str): Name of the table (for logging)
         column_name (str): Name of the column (for logging)
         
@@ -156,7 +234,7 @@ def convert_default_value(default_expr, issues_file, table_name, column_name):
     
     # Handle bare "WITH DEFAULT" (no value) - this is ambiguous in DB2
     if default_expr.upper() == 'WITH DEFAULT':
-        log_issue(issues_file, table_name, column_name,
+        log_issue(issues, table_name, column_name,
                  "ambiguous default removed", f"WITH DEFAULT")
         return ""
     
@@ -166,22 +244,22 @@ def convert_default_value(default_expr, issues_file, table_name, column_name):
     
     # Convert DB2 function names to Snowflake equivalents
     # CURRENT TIMESTAMP -> CURRENT_TIMESTAMP
-    default_expr = re.sub(r'\bCURRENT\s+TIMESTAMP\b', 'CURRENT_TIMESTAMP', default_expr, flags=re.IGNORECASE)
+    default_expr = _RE_CURRENT_TS.sub('CURRENT_TIMESTAMP', default_expr)
     # CURRENT DATE -> CURRENT_DATE
-    default_expr = re.sub(r'\bCURRENT\s+DATE\b', 'CURRENT_DATE', default_expr, flags=re.IGNORECASE)
+    default_expr = _RE_CURRENT_DATE.sub('CURRENT_DATE', default_expr)
     # CURRENT TIME -> CURRENT_TIME
-    default_expr = re.sub(r'\bCURRENT\s+TIME\b', 'CURRENT_TIME', default_expr, flags=re.IGNORECASE)
+    default_expr = _RE_CURRENT_TIME.sub('CURRENT_TIME', default_expr)
     
     # Convert USER to CURRENT_USER (DB2 uses USER, Snowflake uses CURRENT_USER)
-    if re.search(r'\bUSER\b', default_expr, re.IGNORECASE):
-        log_issue(issues_file, table_name, column_name,
+    if _RE_USER.search(default_expr):
+        log_issue(issues, table_name, column_name,
                  "USER converted to CURRENT_USER", default_expr)
-        default_expr = re.sub(r'\bUSER\b', 'CURRENT_USER', default_expr, flags=re.IGNORECASE)
+        default_expr = _RE_USER.sub('CURRENT_USER', default_expr)
     
     return f"DEFAULT {default_expr}"
 
 
-def parse_column_definition(column_def, issues_file, table_name):
+def parse_column_definition(column_def, issues, table_name):
     """
     Parse a single column definition and convert it to Snowflake format.
     
@@ -190,7 +268,7 @@ def parse_column_definition(column_def, issues_file, table_name):
     
     Args:
         column_def (str): The DB2 column definition line
-        issues_file (Path): Path to the issues log file
+        issues (list): Issues collected for this file
         table_name (str): Name of the table (for logging)
         
     Returns:
@@ -210,47 +288,34 @@ def parse_column_definition(column_def, issues_file, table_name):
     column_name = parts[0]
     
     # Find data type (everything after column name until NOT NULL, WITH DEFAULT, etc.)
-    # These keywords mark the end of the data type specification
-    type_end_keywords = ['NOT NULL', 'WITH DEFAULT', 'NULL', 'CONSTRAINT', 'PRIMARY KEY', 'UNIQUE', 'CHECK']
-    type_end_pos = len(column_def)
-    
-    # Find the earliest occurrence of any type-ending keyword
-    for keyword in type_end_keywords:
-        pos = column_def.upper().find(keyword)
-        if pos != -1 and pos < type_end_pos:
-            type_end_pos = pos
+    # The earliest type-ending keyword after the column name marks its end; matching
+    # whole words keeps names like CHECK_NO or type names from cutting it short
+    type_end_match = _RE_TYPE_END.search(column_def, len(column_name))
+    type_end_pos = type_end_match.start() if type_end_match else len(column_def)
     
     # Split the column definition into data type and remaining attributes
     data_type_part = column_def[len(column_name):type_end_pos].strip()
     remaining_part = column_def[type_end_pos:].strip()
     
     # Convert the data type to Snowflake format
-    snowflake_type = convert_data_type(data_type_part, issues_file, table_name, column_name)
+    snowflake_type = convert_data_type(data_type_part, issues, table_name, column_name)
     
     # Parse remaining attributes (constraints, nullability, defaults)
-    not_null = 'NOT NULL' in remaining_part.upper()
-    null_attr = 'NULL' in remaining_part.upper() and 'NOT NULL' not in remaining_part.upper()
+    upper_rem = remaining_part.upper()
+    not_null = 'NOT NULL' in upper_rem
+    null_attr = 'NULL' in upper_rem and not not_null
     
     # Extract default value using regex
-    default_match = re.search(r'WITH\s+DEFAULT\s+([^,\s]+(?:\s+[^,\s]+)*)', remaining_part, re.IGNORECASE)
+    default_match = _RE_WITH_DEFAULT.search(remaining_part)
     default_value = ""
     if default_match:
-        default_value = convert_default_value(default_match.group(0), issues_file, table_name, column_name)
-    
-    # Build the converted column definition
-    result_parts = [column_name, snowflake_type]
-    
-    # Add nullability constraints
-    if not_null:
-        result_parts.append('NOT NULL')
-    elif null_attr:
-        result_parts.append('NULL')
+        default_value = convert_default_value(default_match.group(0), issues, table_name, column_name)
     
-    # Add default value if present
-    if default_value:
-        result_parts.append(default_value)
+    # Build the converted column definition: name, type, nullability, default
+    nullability = ' NOT NULL' if not_null else (' NULL' if null_attr else '')
+    default_suffix = f' {default_value}' if default_value else ''
     
-    return ' '.join(result_parts)
+    return f'{column_name} {snowflake_type}{nullability}{default_suffix}'
 
 
 def extract_primary_keys(statement):
@@ -266,15 +331,23 @@ def extract_primary_keys(statement):
     Returns:
         list: List of column names that form the primary key
     """
+    # Any PRIMARY KEY definition needs the keywords; without them there is nothing to find
+    keyword_match = _RE_PK_KEYWORD.search(statement)
+    if not keyword_match:
+        return []
+    
     # Look for inline PRIMARY KEY (defined with the column)
     # Pattern: column_name data_type ... PRIMARY KEY
-    inline_pk_match = re.search(r'(\w+)\s+[^,\n]+\s+PRIMARY\s+KEY', statement, re.IGNORECASE)
+    # A match can't span a comma, so it starts after the last comma before the first
+    # PRIMARY KEY; searching from there avoids backtracking over every earlier column.
+    search_start = statement.rfind(',', 0, keyword_match.start()) + 1
+    inline_pk_match = _RE_PK_INLINE.search(statement, search_start)
     if inline_pk_match:
         return [inline_pk_match.group(1)]
     
     # Look for table-level PRIMARY KEY definition
     # Pattern: PRIMARY KEY (col1, col2, ...)
-    pk_match = re.search(r'PRIMARY\s+KEY\s*\(([^)]+)\)', statement, re.IGNORECASE | re.DOTALL)
+    pk_match = _RE_PK_TABLE.search(statement)
     if pk_match:
         # Split the column list and clean up whitespace
         pk_columns = [col.strip() for col in pk_match.group(1).split(',')]
@@ -283,7 +356,7 @@ def extract_primary_keys(statement):
     return []  # No primary key found
 
 
-def convert_db2_to_snowflake(content, issues_file, table_name):
+def convert_db2_to_snowflake(content, issues, table_name):
     """
     Convert DB2 CREATE TABLE statement to Snowflake format.
     
@@ -292,16 +365,26 @@ def convert_db2_to_snowflake(content, issues_file, table_name):
     
     Args:
         content (str): The complete DB2 CREATE TABLE statement
-        issues_file (Path): Path to the issues log file
+        issues (list): Issues collected for this file
         table_name (str): Name of the table (for logging)
         
     Returns:
-        str: The converted Snowflake CREATE TABLE statement
+        str: The converted Snowflake CREATE TABLE statement (empty string if the
+             content has no CREATE TABLE statement)
     """
+    # Nothing to convert without a CREATE TABLE statement (e.g. a header-only file)
+    if not _RE_CREATE.search(content):
+        log_issue(issues, table_name, "table", "no CREATE TABLE statement found", "")
+        return ""
+    
+    # Comments (e.g. kept by the splitting script) are not part of the DDL
+    content = strip_comments(content)
+    
     lines = content.split('\n')
-    result_lines = []
+    buf = io.StringIO()  # Converted DDL, written as it is produced
     in_columns = False  # Flag indicating we're processing column definitions
-    column_definitions = []  # List to accumulate converted column definitions
+    column_sep = '\n  '  # Written before the next column; gains a comma after the first
+    depth = 0  # Parenthesis nesting depth, counted from the CREATE TABLE line
     primary_keys = []  # List to store primary key column names
     
     # Extract primary keys first (needed for separate ALTER TABLE statement)
@@ -316,42 +399,46 @@ def convert_db2_to_snowflake(content, issues_file, table_name):
         if line.startswith('--'):
             continue
         
+        line_upper = line.upper()
+        
+        # Track the nesting depth; the column list ends when it returns to 0
+        depth_before = depth
+        code = _RE_STRING.sub('', line) if "'" in line else line
+        depth += code.count('(') - code.count(')')
+        
         # Handle CREATE TABLE line
-        if line.upper().startswith('CREATE TABLE'):
-            # Extract schema and table name
-            # Try schema.table format first
-            match = re.search(r'CREATE\s+TABLE\s+(\w+)\.(\w+)', line, re.IGNORECASE)
+        if line_upper.startswith('CREATE TABLE'):
+            # Extract schema and table name (schema.table, or a table without schema)
+            match = _RE_CREATE.search(line)
             if match:
                 schema, table = match.groups()
-                result_lines.append(f"CREATE TABLE {schema}.{table} (")
+                name = f"{schema}.{table}" if table else schema
+                buf.write(f"CREATE TABLE {name} (")
                 in_columns = True
-            else:
-                # Handle tables without schema
-                match = re.search(r'CREATE\s+TABLE\s+(\w+)', line, re.IGNORECASE)
-                if match:
-                    table = match.group(1)
-                    result_lines.append(f"CREATE TABLE {table} (")
-                    in_columns = True
             continue
         
-        # Skip DB2-specific options that don't apply to Snowflake
-        if any(keyword in line.upper() for keyword in ['PARTITION BY', 'AUDIT', 'DATA CAPTURE', 'CCSID']):
-            continue
-        
-        # Handle end of column definitions
-        if line == ')' or line == ');':
+        # Handle end of column definitions; table options after the closing
+        # parenthesis on the same line (e.g. ") IN DB1.TS1;") are dropped
+        if line.startswith(')') and depth <= 0:
             in_columns = False
-            # Add all converted column definitions
-            for i, col_def in enumerate(column_definitions):
-                comma = ',' if i < len(column_definitions) - 1 else ''
-                result_lines.append(f"  {col_def}{comma}")
-            result_lines.append(");")
+            if buf.tell():
+                buf.write('\n')
+            buf.write(");")
             break
         
+        # Skip the inner lines of an element spanning several lines, e.g. the
+        # condition and closing parenthesis of a multi-line CHECK constraint
+        if depth_before > 1 or line.startswith(')'):
+            continue
+        
+        # Skip DB2-specific options that don't apply to Snowflake
+        if _RE_SKIP_OPTS.search(line):
+            continue
+        
         # Handle column definitions
         if in_columns:
             # Skip constraint definitions (handled separately)
-            if line.upper().startswith(('CONSTRAINT', 'PRIMARY KEY', 'UNIQUE', 'CHECK')):
+            if _RE_CONSTRAINT_LINE.match(line):
                 continue
                 
             # Remove trailing comma from column definition
@@ -359,47 +446,59 @@ def convert_db2_to_snowflake(content, issues_file, table_name):
                 line = line[:-1]
             
             # Parse and convert column definition
-            converted_col = parse_column_definition(line, issues_file, table_name)
+            converted_col = parse_column_definition(line, issues, table_name)
             if converted_col and converted_col.strip():
-                column_definitions.append(converted_col)
+                buf.write(column_sep)
+                buf.write(converted_col)
+                column_sep = ',\n  '
     
     # Add PRIMARY KEY as separate ALTER TABLE statement
     # Snowflake requires primary keys to be added after table creation
     if primary_keys:
         pk_columns = ', '.join(primary_keys)
-        result_lines.append(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({pk_columns});")
+        if buf.tell():
+            buf.write('\n')
+        buf.write(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({pk_columns});")
     
-    return '\n'.join(result_lines)
+    return buf.getvalue()
 
 
-def process_table_file(input_file, output_dir, issues_file):
+def process_table_file(input_file, output_dir):
     """
     Process a single table file and convert it to Snowflake format.
     
     This function reads a DB2 table file, converts it to Snowflake format,
     and writes the result to the output directory while preserving headers.
+    Issues are collected in memory and returned rather than appended to the
+    issues log, so files can be converted in parallel worker processes.
     
     Args:
-        input_file (Path): Path to the input DB2 table file
-        output_dir (Path): Directory where output files will be written
-        issues_file (Path): Path to the issues log file
+        input_file (str or Path): Path to the input DB2 .sql table file
+        output_dir (str or Path): Existing directory where output files will be written
         
     Returns:
-        bool: True if conversion was successful, False otherwise
+        tuple: (success, issues) - True if conversion was successful, False otherwise,
+               and the list of issues logged for this file
     """
     logging.info(f"Processing {input_file}")
+    issues = []  # Issues for this file, written to the issues log by main()
     
-    # Read the input file
+    # Read the input file (binary read + decode skips the text I/O layer)
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(input_file, 'rb') as f:
+            content = f.read().decode('utf-8')
     except Exception as e:
         logging.error(f"Error reading {input_file}: {e}")
-        log_issue(issues_file, "parse_error", "file_read", str(e), str(input_file))
-        return False
+        log_issue(issues, "parse_error", "file_read", str(e), str(input_file))
+        return False, issues
+    
+    # Normalize \r\n and \r line endings like text-mode reading would
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
     
     # Extract table name from filename (SCHEMA__TABLE.sql -> SCHEMA.TABLE)
-    table_name = input_file.stem.replace('__', '.')
+    file_name = os.path.basename(input_file)
+    table_name = file_name[:-4].replace('__', '.')
     
     # Extract header lines (comments at the top of the file)
     lines = content.split('\n')
@@ -416,30 +515,27 @@ def process_table_file(input_file, output_dir, issues_file):
     
     # Convert the DB2 statement to Snowflake format
     try:
-        converted_content = convert_db2_to_snowflake(content, issues_file, table_name)
+        converted_content = convert_db2_to_snowflake(content, issues, table_name)
     except Exception as e:
         logging.error(f"Error converting {input_file}: {e}")
-        log_issue(issues_file, table_name, "conversion_error", str(e), str(input_file))
-        return False
+        log_issue(issues, table_name, "conversion_error", str(e), str(input_file))
+        return False, issues
     
     # Create output file with the same name as input
-    output_file = output_dir / input_file.name
+    output_file = os.path.join(output_dir, file_name)
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # Write preserved header lines
-            for header_line in header_lines:
-                f.write(header_line + '\n')
-            f.write('\n')  # Add blank line after header
-            # Write converted content
-            f.write(converted_content)
+        # Preserved header lines, a blank line, then the converted content
+        output_text = ''.join(header_line + '\n' for header_line in header_lines) + '\n' + converted_content
+        with open(output_file, 'wb') as f:
+            f.write(output_text.encode('utf-8'))
         
-        logging.info(f"Converted {table_name} to {output_file.name}")
-        return True
+        logging.info(f"Converted {table_name} to {file_name}")
+        return True, issues
     except Exception as e:
         logging.error(f"Error writing {output_file}: {e}")
-        log_issue(issues_file, table_name, "file_write", str(e), str(input_file))
-        return False
+        log_issue(issues, table_name, "file_write", str(e), str(input_file))
+        return False, issues
 
 
 def main():
@@ -457,6 +553,9 @@ def main():
                        help='Output directory for Snowflake table files')
     parser.add_argument('--issues', dest='issues_file', default='data/output/issues.txt',
                        help='Issues log file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Number of worker processes used to convert table files in parallel '
+                            '(at most 61 on Windows)')
     parser.add_argument('--selftest', action='store_true',
                        help='Run self-test with sample data')
     
@@ -482,9 +581,22 @@ CREATE TABLE APP.ACCOUNT (
   NAME VARCHAR(100) FOR SBCS DATA NOT NULL WITH DEFAULT '',
   CRT_TS TIMESTAMP NOT NULL WITH DEFAULT CURRENT TIMESTAMP,
   BAL DECIMAL(18,2) WITH DEFAULT 0,
+  CONSTRAINT CK_BAL CHECK (
+    BAL >= 0
+  ),
   NOTES CLOB(1M),
+  DESCR VARGRAPHIC(200),
+  UPD_TS TIMESTAMP(6),
+  EVT_TS TIMESTAMP(6) WITH TIME ZONE,
+  RATE DECFLOAT(34),
+  FACTOR DOUBLE PRECISION,
+  CHECK_NO INTEGER NOT NULL,
+  NULLABLE_FLAG CHAR(1),
+  UNIQUE_ID BIGINT,
+  AUDIT_TS TIMESTAMP,
+  CCSID_NO SMALLINT,
   CODE CHAR(3) WITH DEFAULT
-);"""
+) IN DB1.TS1 CCSID UNICODE;"""
         
         test_file = test_input_dir / 'APP__ACCOUNT.sql'
         with open(test_file, 'w', encoding='utf-8') as f:
@@ -494,19 +606,40 @@ CREATE TABLE APP.ACCOUNT (
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Clear issues file for clean test
-        issues_file = Path(args.issues_file)
-        issues_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(issues_file, 'w', encoding='utf-8') as f:
-            f.write("")
+        success, issues = process_table_file(test_file, output_dir)
         
-        success = process_table_file(test_file, output_dir, issues_file)
+        # Write a clean issues file for the test
+        write_issues(Path(args.issues_file), issues)
         
         # Clean up test file
         test_file.unlink()
         
+        if not success:
+            return 3
+        
+        # Check the converted DDL for the expected Snowflake text
+        converted = (output_dir / 'APP__ACCOUNT.sql').read_text(encoding='utf-8')
+        expected = [
+            "  BAL NUMBER(18,2) DEFAULT 0,\n  NOTES VARCHAR,",  # Multi-line CHECK is skipped whole
+            "  DESCR VARCHAR(200),",  # VARGRAPHIC keeps its length
+            "  UPD_TS TIMESTAMP_NTZ(6),",  # TIMESTAMP keeps its precision
+            "  EVT_TS TIMESTAMP_TZ(6),",
+            "  RATE FLOAT,",  # DECFLOAT(34) has no Snowflake precision
+            "  FACTOR FLOAT,",  # DOUBLE PRECISION is DOUBLE
+            "  CHECK_NO INTEGER NOT NULL,",  # Keywords inside column names don't end the type
+            "  NULLABLE_FLAG CHAR(1),",
+            "  UNIQUE_ID BIGINT,",
+            "  AUDIT_TS TIMESTAMP_NTZ,",  # Option keywords inside column names aren't options
+            "  CCSID_NO SMALLINT,",
+            "  CODE CHAR(3)\n);",  # Closing line with table options ends the column list
+        ]
+        for snippet in expected:
+            if snippet not in converted:
+                logging.error(f"Self-test failed: {snippet!r} not found in converted DDL:\n{converted}")
+                return 3
+        
         logging.info("Self-test completed")
-        return 0 if success else 3
+        return 0
     
     # Normal processing mode
     input_dir = Path(args.input_dir)
@@ -514,12 +647,14 @@ CREATE TABLE APP.ACCOUNT (
     issues_file = Path(args.issues_file)
     
     # Validate input directory exists
-    if not input_dir.exists():
+    if not input_dir.is_dir():
         logging.error(f"Input directory {input_dir} does not exist")
         return 2
     
-    # Find all .sql files in input directory
-    sql_files = list(input_dir.glob('*.sql'))
+    # Find all .sql files in input directory (sorted so the issues log order is stable)
+    with os.scandir(input_dir) as entries:
+        sql_files = sorted(entry.path for entry in entries
+                           if entry.name.endswith('.sql') and entry.is_file())
     if not sql_files:
         logging.error(f"No .sql files found in {input_dir}")
         return 2
@@ -527,18 +662,33 @@ CREATE TABLE APP.ACCOUNT (
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Clear issues file for fresh run
-    issues_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(issues_file, 'w', encoding='utf-8') as f:
-        f.write("")
+    # Convert the table files in parallel; each file is independent of the others.
+    # A single file (or --workers 1) is converted in this process to skip pool startup.
+    workers = max(1, min(args.workers, len(sql_files)))
+    if sys.platform == 'win32':
+        # ProcessPoolExecutor accepts at most 61 workers on Windows
+        workers = min(workers, 61)
     
-    # Process each DB2 table file
+    out_dir_str = str(output_dir)  # Workers join plain strings instead of building Paths
+    
+    if workers == 1:
+        results = [process_table_file(sql_file, out_dir_str) for sql_file in sql_files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=setup_logging) as executor:
+            results = list(executor.map(process_table_file, sql_files,
+                                        [out_dir_str] * len(sql_files), chunksize=8))
+    
+    # Gather issues in file order; only this process writes the issues log, once
     converted_count = 0  # Counter for successfully converted tables
+    all_issues = []
     
-    for sql_file in sql_files:
-        if process_table_file(sql_file, output_dir, issues_file):
+    for success, issues in results:
+        all_issues.extend(issues)
+        if success:
             converted_count += 1
     
+    write_issues(issues_file, all_issues)
+    
     # Validate that at least one table was converted
     if converted_count == 0:
         logging.error("No tables were successfully converted")
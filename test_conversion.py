@@ -44,7 +44,7 @@ def main():
     
     # Test 1: Self-test for DDL splitting
     success1 = run_command(
-        "python scripts/01_split_db2_ddl.py --selftest --out data/output/original_db2_table_creation",
+        "python scripts/01_split_db2_ddl.py --selftest-integration --out data/output/original_db2_table_creation",
         "DDL Splitting Self-Test"
     )
     